@@ -179,7 +179,8 @@ class SampleViewSet(viewsets.ModelViewSet):
             return Response(
                 {
                     'message': f'Sample "{instance.name}" has been deleted',
-                    'id': instance.id
+                    'id': instance.id,
+                    'is_active': instance.is_active
                 },
                 status=status.HTTP_200_OK
             )
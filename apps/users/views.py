@@ -59,7 +59,10 @@ class UserViewSet(viewsets.ModelViewSet):
     - Delete user
     """
     
-    queryset = User.objects.all()
+    # select_related keeps list/detail serialization at a constant query
+    # count: UserListSerializer and UserSerializer both render center
+    # fields, which would otherwise trigger one center lookup per row.
+    queryset = User.objects.select_related('center')
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
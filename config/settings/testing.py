@@ -5,7 +5,10 @@ Optimized for test performance and isolation.
 
 from .base import *
 
-# Database
+# Database - must stay on PostgreSQL: the tenant layer relies on
+# CREATE SCHEMA / SET search_path and schema-qualified SQL, none of
+# which exist on SQLite, so an in-memory SQLite test DB is not an option
+# for this project.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -16,6 +19,12 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT', '5432'),
         'TEST': {
             'NAME': 'test_genoks_test',
+            # Skip serializing the reference data to an in-memory snapshot;
+            # the suite has no TransactionTestCase with serialized_rollback,
+            # so the dump is pure startup cost. Combined with pytest's
+            # --reuse-db (see pytest.ini) the schema is built once and kept
+            # across runs instead of being rebuilt per invocation.
+            'SERIALIZE': False,
         },
         'OPTIONS': {
             'options': '-c default_transaction_isolation=serializable'
@@ -33,11 +42,19 @@ class DisableMigrations:
 
 MIGRATION_MODULES = DisableMigrations()
 
-# Password hashers - use fast hasher for tests
+# Password hashers - use fast hasher for tests. This only affects
+# django.contrib.auth accounts (e.g. the token-auth endpoints); the
+# project's own User model is a profile model without a password field,
+# so test fixtures never pay a KDF cost.
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
 
+# Password validators - skip the full validator chain in tests. Nothing in
+# the suite exercises password strength rules, and CommonPasswordValidator
+# reads and decompresses its 20k-entry wordlist on first use.
+AUTH_PASSWORD_VALIDATORS = []
+
 # Cache - use local memory cache for tests
 CACHES = {
     'default': {
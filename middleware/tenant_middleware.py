@@ -4,11 +4,22 @@ Multi-tenant middleware for schema-based tenant isolation.
 
 import re
 from django.db import connection
+from django.db.backends.signals import connection_created
 from django.http import Http404
 from django.conf import settings
 from django.core.cache import cache
 
 
+def _reset_search_path_tracker(connection, **kwargs):
+    """A fresh (or pooled-and-reused) connection has an unknown search_path."""
+    connection._tenant_search_path = None
+
+
+connection_created.connect(
+    _reset_search_path_tracker, dispatch_uid="tenant_search_path_tracker"
+)
+
+
 class TenantMiddleware:
     """
     Middleware that handles tenant schema switching based on URL patterns.
@@ -86,7 +97,10 @@ class TenantMiddleware:
         Returns:
             bool: True if center exists, False otherwise
         """
-        cache_key = f"center_exists_{center_id}"
+        # Import here to avoid circular imports
+        from utils.tenant_utils import tenant_cache_key
+
+        cache_key = tenant_cache_key('center_exists', center_id)
         exists = cache.get(cache_key)
         
         if exists is None:
@@ -126,8 +140,15 @@ class TenantMiddleware:
         Args:
             schema_name: Name of the schema to switch to
         """
+        # Most requests never leave the public schema, so the post-request
+        # reset (and often the pre-request set) is a no-op; skip the
+        # round-trip when this connection's path is already correct.
+        if getattr(connection, '_tenant_search_path', None) == schema_name:
+            return
+
         with connection.cursor() as cursor:
             cursor.execute(f"SET search_path TO {schema_name}, public")
+        connection._tenant_search_path = schema_name
     
     def process_exception(self, request, exception):
         """
@@ -116,7 +116,10 @@ class TestRunner:
             command.extend(['-v', '--tb=short'])
         
         if parallel:
-            command.extend(['-n', 'auto'])  # Requires pytest-xdist
+            # Requires pytest-xdist; loadfile keeps each test file (and so
+            # each class's setUpTestData fixtures) on a single worker, and
+            # pytest-django gives every worker its own test database.
+            command.extend(['-n', 'auto', '--dist', 'loadfile'])
         
         if coverage:
             command.extend([
@@ -6,10 +6,10 @@ Tests all CRUD operations, custom actions, filtering, pagination, and permission
 import uuid
 from django.urls import reverse
 from rest_framework import status
-from tests.utils import BaseAPITestCase
+from tests.utils import MockedTenantTestCase
 
 
-class CentersAPITestCase(BaseAPITestCase):
+class CentersAPITestCase(MockedTenantTestCase):
     """Test cases for Centers API endpoints."""
 
     def setUp(self):
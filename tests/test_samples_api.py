@@ -4,34 +4,64 @@ Tests multi-tenant functionality, CRUD operations, workflow states, and permissi
 """
 
 import uuid
-from django.urls import reverse
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
+from rest_framework.test import APIRequestFactory
 from tests.utils import TenantAwareTestCase
-from utils.tenant_utils import set_tenant_schema_context
-from apps.centers.models import Center
+from apps.samples.models import Sample
+from apps.samples.views import SampleViewSet
 
 
 class SamplesAPITestCase(TenantAwareTestCase):
     """Test cases for Samples API endpoints."""
 
-    def setUp(self):
-        super().setUp()
-        # Samples URLs are under centers/{center_id}/samples/
-        self.samples_url = lambda center_id: f'/api/centers/{center_id}/samples/'
-        self.sample_detail_url = lambda center_id, pk: f'/api/centers/{center_id}/samples/{pk}/'
-        self.sample_restore_url = lambda center_id, pk: f'/api/centers/{center_id}/samples/{pk}/restore/'
-        self.sample_process_url = lambda center_id, pk: f'/api/centers/{center_id}/samples/{pk}/process/'
-        self.sample_by_barcode_url = lambda center_id: f'/api/centers/{center_id}/samples/by_barcode/'
-        self.sample_by_user_url = lambda center_id: f'/api/centers/{center_id}/samples/by_user/'
-        self.sample_by_status_url = lambda center_id: f'/api/centers/{center_id}/samples/by_status/'
-        self.sample_by_type_url = lambda center_id: f'/api/centers/{center_id}/samples/by_type/'
-        self.sample_stats_url = lambda center_id: f'/api/centers/{center_id}/samples/stats/'
+    # Stateless factory shared by the direct view-call tests below; these
+    # skip URL resolution and the middleware chain entirely. Tests that
+    # rely on TenantMiddleware schema switching must keep self.client.
+    factory = APIRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Samples URLs are under centers/{center_id}/samples/. The per-center
+        # prefixes are stable for the class, so constant-fold them once here
+        # instead of rebuilding full f-strings in every test.
+        cls._samples_base = {
+            cls.test_center.id: f'/api/centers/{cls.test_center.id}/samples/',
+            cls.another_center.id: f'/api/centers/{cls.another_center.id}/samples/',
+        }
+
+    def samples_url(self, center_id):
+        return self._samples_base[center_id]
+
+    def sample_detail_url(self, center_id, pk):
+        return f'{self._samples_base[center_id]}{pk}/'
+
+    def sample_restore_url(self, center_id, pk):
+        return f'{self._samples_base[center_id]}{pk}/restore/'
+
+    def sample_process_url(self, center_id, pk):
+        return f'{self._samples_base[center_id]}{pk}/process/'
+
+    def sample_by_barcode_url(self, center_id):
+        return f'{self._samples_base[center_id]}by_barcode/'
+
+    def sample_by_user_url(self, center_id):
+        return f'{self._samples_base[center_id]}by_user/'
+
+    def sample_by_status_url(self, center_id):
+        return f'{self._samples_base[center_id]}by_status/'
+
+    def sample_by_type_url(self, center_id):
+        return f'{self._samples_base[center_id]}by_type/'
+
+    def sample_stats_url(self, center_id):
+        return f'{self._samples_base[center_id]}stats/'
 
     def create_test_sample(self, center, **kwargs):
         """Create a test sample in the specified center's schema."""
-        # Import here to avoid circular imports
-        from apps.samples.models import Sample
-        
         sample_data = {
             'name': 'Test Sample',
             'description': 'Test sample description',
@@ -46,26 +76,42 @@ class SamplesAPITestCase(TenantAwareTestCase):
             sample = Sample.objects.create(**sample_data)
             return sample
 
+    def create_test_samples(self, center, specs):
+        """Bulk-create test samples in the specified center's schema.
+
+        Builds unsaved Sample instances from the given override dicts and
+        inserts them with a single bulk_create inside one tenant context,
+        instead of one INSERT + schema switch per sample.
+        """
+        defaults = {
+            'name': 'Test Sample',
+            'description': 'Test sample description',
+            'sample_type': 'blood',
+            'status': 'pending',
+            'user_id': self.admin_user.id,
+            'collection_location': 'Test Location',
+        }
+        samples = [Sample(**{**defaults, **spec}) for spec in specs]
+
+        with self.with_tenant_context(center):
+            Sample.objects.bulk_create(samples, batch_size=500)
+
+        return samples
+
     # List Samples Tests
     def test_list_samples_unauthenticated(self):
         """Test that unauthenticated users cannot access samples list."""
-        url = self.samples_url(self.test_center.id)
-        response = self.client.get(url)
-        self.assertResponseError(response, status.HTTP_403_FORBIDDEN)
+        request = self.factory.get(self.samples_url(self.test_center.id))
+        response = SampleViewSet.as_view({'get': 'list'})(request)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_list_samples_authenticated(self):
         """Test authenticated users can list samples from their center."""
         # Create test samples in tenant schema
-        self.create_test_sample(
-            self.test_center,
-            name='Sample 1',
-            sample_type='blood'
-        )
-        self.create_test_sample(
-            self.test_center,
-            name='Sample 2',
-            sample_type='urine'
-        )
+        self.create_test_samples(self.test_center, [
+            {'name': 'Sample 1', 'sample_type': 'blood'},
+            {'name': 'Sample 2', 'sample_type': 'urine'},
+        ])
         
         self.authenticate_admin()
         url = self.samples_url(self.test_center.id)
@@ -77,39 +123,27 @@ class SamplesAPITestCase(TenantAwareTestCase):
 
     def test_list_samples_pagination(self):
         """Test samples list pagination."""
-        # Create multiple samples
-        for i in range(5):
-            self.create_test_sample(
-                self.test_center,
-                name=f'Sample {i}',
-                sample_type='blood'
-            )
+        # Create multiple samples with a single INSERT
+        self.create_test_samples(self.test_center, [
+            {'name': f'Sample {i}', 'sample_type': 'blood'} for i in range(5)
+        ])
         
         self.authenticate_admin()
         url = self.samples_url(self.test_center.id) + '?page_size=3'
         response = self.client.get(url)
         self.assertResponseSuccess(response)
         
-        # Check pagination structure
-        self.assertIn('count', response.data)
-        self.assertIn('next', response.data)
-        self.assertIn('previous', response.data)
-        self.assertIn('results', response.data)
+        # Check pagination structure with a single superset comparison
+        self.assertGreaterEqual(response.data.keys(), {'count', 'next', 'previous', 'results'})
         self.assertEqual(len(response.data['results']), 3)
 
     def test_list_samples_filtering_by_status(self):
         """Test samples list filtering by status."""
         # Create samples with different statuses
-        self.create_test_sample(
-            self.test_center,
-            name='Pending Sample',
-            status='pending'
-        )
-        self.create_test_sample(
-            self.test_center,
-            name='Processing Sample',
-            status='processing'
-        )
+        self.create_test_samples(self.test_center, [
+            {'name': 'Pending Sample', 'status': 'pending'},
+            {'name': 'Processing Sample', 'status': 'processing'},
+        ])
         
         self.authenticate_admin()
         url = self.samples_url(self.test_center.id)
@@ -118,30 +152,22 @@ class SamplesAPITestCase(TenantAwareTestCase):
         response = self.client.get(url, {'status': 'pending'})
         self.assertResponseSuccess(response)
         
-        for sample in response.data['results']:
-            self.assertEqual(sample['status'], 'pending')
+        self.assertTrue(all(s['status'] == 'pending' for s in response.data['results']))
 
     def test_list_samples_filtering_by_type(self):
         """Test samples list filtering by sample type."""
-        self.create_test_sample(
-            self.test_center,
-            name='Blood Sample',
-            sample_type='blood'
-        )
-        self.create_test_sample(
-            self.test_center,
-            name='Urine Sample',
-            sample_type='urine'
-        )
-        
+        self.create_test_samples(self.test_center, [
+            {'name': 'Blood Sample', 'sample_type': 'blood'},
+            {'name': 'Urine Sample', 'sample_type': 'urine'},
+        ])
+
         self.authenticate_admin()
         url = self.samples_url(self.test_center.id)
-        
+
         response = self.client.get(url, {'sample_type': 'blood'})
         self.assertResponseSuccess(response)
         
-        for sample in response.data['results']:
-            self.assertEqual(sample['sample_type'], 'blood')
+        self.assertTrue(all(s['sample_type'] == 'blood' for s in response.data['results']))
 
     def test_list_samples_search(self):
         """Test samples list search functionality."""
@@ -158,6 +184,41 @@ class SamplesAPITestCase(TenantAwareTestCase):
         self.assertResponseSuccess(response)
         self.assertGreater(response.data['count'], 0)
 
+    def test_list_samples_query_count_constant(self):
+        """Test the list endpoint's query count does not grow with row count.
+
+        Guards against N+1 regressions in the samples viewset: a missing
+        select_related/prefetch_related would make the second request issue
+        more queries than the first.
+        """
+        self.create_test_samples(self.test_center, [
+            {'name': f'Query Count Sample {i}'} for i in range(2)
+        ])
+
+        self.authenticate_admin()
+        url = self.samples_url(self.test_center.id)
+
+        # Unmeasured warm-up: the first request on a fresh connection pays
+        # one-off middleware queries (center_exists lookup, initial
+        # SET search_path) that would skew the baseline.
+        self.assertResponseSuccess(self.client.get(url))
+
+        with CaptureQueriesContext(connection) as baseline:
+            self.assertResponseSuccess(self.client.get(url))
+
+        self.create_test_samples(self.test_center, [
+            {'name': f'Query Count Extra Sample {i}'} for i in range(10)
+        ])
+
+        with CaptureQueriesContext(connection) as grown:
+            self.assertResponseSuccess(self.client.get(url))
+
+        self.assertEqual(
+            len(baseline), len(grown),
+            f"List endpoint query count grew with result size "
+            f"({len(baseline)} -> {len(grown)}); likely an N+1 regression"
+        )
+
     def test_list_samples_ordering(self):
         """Test samples list ordering."""
         self.authenticate_admin()
@@ -178,12 +239,12 @@ class SamplesAPITestCase(TenantAwareTestCase):
         sample_data = {
             'name': 'New Sample',
             'sample_type': 'blood',
-            'user_id': str(self.admin_user.id)
+            'user_id': self.admin_user.id
         }
-        
-        url = self.samples_url(self.test_center.id)
-        response = self.client.post(url, sample_data)
-        self.assertResponseError(response, status.HTTP_403_FORBIDDEN)
+
+        request = self.factory.post(self.samples_url(self.test_center.id), sample_data)
+        response = SampleViewSet.as_view({'post': 'create'})(request)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_create_sample_authenticated(self):
         """Test authenticated users can create samples."""
@@ -193,7 +254,7 @@ class SamplesAPITestCase(TenantAwareTestCase):
             'name': 'New Sample',
             'description': 'New sample description',
             'sample_type': 'blood',
-            'user_id': str(self.admin_user.id),
+            'user_id': self.admin_user.id,
             'collection_location': 'Test Location'
         }
         
@@ -216,7 +277,7 @@ class SamplesAPITestCase(TenantAwareTestCase):
         invalid_data = {
             'name': 'Invalid Sample',
             'sample_type': 'invalid_type',
-            'user_id': str(self.admin_user.id)
+            'user_id': self.admin_user.id
         }
         
         response = self.client.post(url, invalid_data)
@@ -243,9 +304,9 @@ class SamplesAPITestCase(TenantAwareTestCase):
             name='Test Sample'
         )
         
-        url = self.sample_detail_url(self.test_center.id, sample.id)
-        response = self.client.get(url)
-        self.assertResponseError(response, status.HTTP_403_FORBIDDEN)
+        request = self.factory.get(self.sample_detail_url(self.test_center.id, sample.id))
+        response = SampleViewSet.as_view({'get': 'retrieve'})(request, pk=sample.id)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_retrieve_sample_not_found(self):
         """Test retrieving non-existent sample."""
@@ -286,8 +347,9 @@ class SamplesAPITestCase(TenantAwareTestCase):
         
         update_data = {'name': 'Updated Sample'}
         url = self.sample_detail_url(self.test_center.id, sample.id)
-        response = self.client.patch(url, update_data)
-        self.assertResponseError(response, status.HTTP_403_FORBIDDEN)
+        request = self.factory.patch(url, update_data)
+        response = SampleViewSet.as_view({'patch': 'partial_update'})(request, pk=sample.id)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     # Delete Sample Tests
     def test_delete_sample_authenticated(self):
@@ -302,11 +364,10 @@ class SamplesAPITestCase(TenantAwareTestCase):
         url = self.sample_detail_url(self.test_center.id, sample.id)
         response = self.client.delete(url)
         self.assertResponseSuccess(response)
-        
-        # Verify sample is soft deleted
-        with self.with_tenant_context(self.test_center):
-            sample.refresh_from_db()
-            self.assertFalse(sample.is_active)
+
+        # The delete response reports the post-delete state, so no extra
+        # tenant context switch + SELECT is needed to verify the soft delete
+        self.assertFalse(response.data['is_active'])
 
     def test_delete_sample_unauthenticated(self):
         """Test that unauthenticated users cannot delete samples."""
@@ -315,20 +376,20 @@ class SamplesAPITestCase(TenantAwareTestCase):
             name='Test Sample'
         )
         
-        url = self.sample_detail_url(self.test_center.id, sample.id)
-        response = self.client.delete(url)
-        self.assertResponseError(response, status.HTTP_403_FORBIDDEN)
+        request = self.factory.delete(self.sample_detail_url(self.test_center.id, sample.id))
+        response = SampleViewSet.as_view({'delete': 'destroy'})(request, pk=sample.id)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     # Restore Sample Tests
     def test_restore_sample_authenticated(self):
         """Test authenticated users can restore soft-deleted samples."""
-        sample = self.create_test_sample(
-            self.test_center,
-            name='To Restore Sample'
-        )
-        
-        # Soft delete the sample
+        # Create and soft delete within one tenant context; the nested
+        # context entered by create_test_sample is a no-op re-entry.
         with self.with_tenant_context(self.test_center):
+            sample = self.create_test_sample(
+                self.test_center,
+                name='To Restore Sample'
+            )
             sample.soft_delete()
         
         self.authenticate_admin()
@@ -385,15 +446,49 @@ class SamplesAPITestCase(TenantAwareTestCase):
         
         self.authenticate_admin()
         
-        url = self.sample_by_barcode_url(self.test_center.id)
+        # Prebuilt query string avoids the client's per-call urlencoding
+        url = self.sample_by_barcode_url(self.test_center.id) + '?barcode=TEST123'
         try:
-            response = self.client.get(url, {'barcode': 'TEST123'})
+            response = self.client.get(url)
             if response.status_code == 404:
                 self.skipTest("By barcode endpoint not implemented")
             self.assertResponseSuccess(response)
+            # The created sample must actually come back for this barcode
+            self.assertIn('data', response.data)
+            self.assertEqual(response.data['data']['barcode'], 'TEST123')
         except Exception as e:
             self.skipTest(f"By barcode endpoint not available: {e}")
 
+    def test_sample_barcode_lookup_uses_index(self):
+        """Test that barcode lookups are served by an index, not a Seq Scan."""
+        # The unique constraint on barcode must be index-backed
+        self.assertTrue(Sample._meta.get_field('barcode').unique)
+
+        # Populate enough rows that the planner would only pick an index
+        # if one actually exists, then check the plan for the lookup.
+        with self.with_tenant_context(self.test_center):
+            Sample.objects.bulk_create([
+                Sample(
+                    name=f'Index Sample {i}',
+                    sample_type='blood',
+                    status='pending',
+                    user_id=self.admin_user.id,
+                    barcode=f'IDX-{i:06d}'
+                )
+                for i in range(1000)
+            ])
+
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE samples")
+                cursor.execute(
+                    "EXPLAIN SELECT * FROM samples WHERE barcode = %s",
+                    ['IDX-000500']
+                )
+                plan = str(cursor.fetchall())
+
+            self.assertNotIn('Seq Scan', plan,
+                             f"Barcode lookup fell back to a sequential scan: {plan}")
+
     def test_samples_by_user(self):
         """Test getting samples by user."""
         self.create_test_sample(
@@ -404,12 +499,14 @@ class SamplesAPITestCase(TenantAwareTestCase):
         
         self.authenticate_admin()
         
-        url = self.sample_by_user_url(self.test_center.id)
+        url = self.sample_by_user_url(self.test_center.id) + f'?user_id={self.admin_user.id}'
         try:
-            response = self.client.get(url, {'user_id': str(self.admin_user.id)})
+            response = self.client.get(url)
             if response.status_code == 404:
                 self.skipTest("By user endpoint not implemented")
             self.assertResponseSuccess(response)
+            self.assertIn('data', response.data)
+            self.assertTrue(any(s['name'] == 'User Sample' for s in response.data['data']))
         except Exception as e:
             self.skipTest(f"By user endpoint not available: {e}")
 
@@ -423,12 +520,14 @@ class SamplesAPITestCase(TenantAwareTestCase):
         
         self.authenticate_admin()
         
-        url = self.sample_by_status_url(self.test_center.id)
+        url = self.sample_by_status_url(self.test_center.id) + '?status=pending'
         try:
-            response = self.client.get(url, {'status': 'pending'})
+            response = self.client.get(url)
             if response.status_code == 404:
                 self.skipTest("By status endpoint not implemented")
             self.assertResponseSuccess(response)
+            self.assertIn('data', response.data)
+            self.assertTrue(any(s['name'] == 'Pending Sample' for s in response.data['data']))
         except Exception as e:
             self.skipTest(f"By status endpoint not available: {e}")
 
@@ -442,28 +541,24 @@ class SamplesAPITestCase(TenantAwareTestCase):
         
         self.authenticate_admin()
         
-        url = self.sample_by_type_url(self.test_center.id)
+        url = self.sample_by_type_url(self.test_center.id) + '?sample_type=blood'
         try:
-            response = self.client.get(url, {'sample_type': 'blood'})
+            response = self.client.get(url)
             if response.status_code == 404:
                 self.skipTest("By type endpoint not implemented")
             self.assertResponseSuccess(response)
+            self.assertIn('data', response.data)
+            self.assertTrue(any(s['name'] == 'Blood Sample' for s in response.data['data']))
         except Exception as e:
             self.skipTest(f"By type endpoint not available: {e}")
 
     def test_samples_stats(self):
         """Test getting samples statistics."""
         # Create some samples for stats
-        self.create_test_sample(
-            self.test_center,
-            name='Stats Sample 1',
-            status='pending'
-        )
-        self.create_test_sample(
-            self.test_center,
-            name='Stats Sample 2',
-            status='completed'
-        )
+        self.create_test_samples(self.test_center, [
+            {'name': 'Stats Sample 1', 'status': 'pending'},
+            {'name': 'Stats Sample 2', 'status': 'completed'},
+        ])
         
         self.authenticate_admin()
         
@@ -499,19 +594,42 @@ class SamplesAPITestCase(TenantAwareTestCase):
         response1 = self.client.get(url1)
         self.assertResponseSuccess(response1)
         
-        sample_names = [s['name'] for s in response1.data['results']]
         # Note: In test environment, middleware might not work the same way
         # This test verifies that the API returns samples, but tenant isolation
         # is primarily handled by the middleware in production
-        self.assertIn('Center 1 Sample', sample_names)
-        
-        # Get samples from another_center - should only see sample2  
+        self.assertTrue(any(s['name'] == 'Center 1 Sample' for s in response1.data['results']))
+
+        # Get samples from another_center - should only see sample2
         url2 = self.samples_url(self.another_center.id)
         response2 = self.client.get(url2)
         self.assertResponseSuccess(response2)
-        
-        sample_names2 = [s['name'] for s in response2.data['results']]
-        self.assertIn('Center 2 Sample', sample_names2)
-        
-        # In a real multi-tenant setup, these would be isolated
-        # But in tests, we're verifying the API structure works 
\ No newline at end of file
+        self.assertTrue(any(s['name'] == 'Center 2 Sample' for s in response2.data['results']))
+
+        # Schema-level placement can only be checked when the tenant
+        # schemas actually contain a samples table. The test settings run
+        # with migrations disabled, so pytest-django syncs every table
+        # into public and sample writes fall through the search_path —
+        # probe with to_regclass before asserting placement.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT to_regclass(%s), to_regclass(%s)",
+                [f"{self.test_center_schema}.samples",
+                 f"{self.another_center_schema}.samples"]
+            )
+            tenant_tables = cursor.fetchone()
+
+        if all(tenant_tables):
+            # One schema-qualified query covers both tenants at once,
+            # with no search_path switching at all.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'SELECT \'test_center\', id FROM "{self.test_center_schema}".samples '
+                    f'UNION ALL '
+                    f'SELECT \'another_center\', id FROM "{self.another_center_schema}".samples'
+                )
+                placement = set(cursor.fetchall())
+
+            self.assertIn(('test_center', sample1.id), placement)
+            self.assertIn(('another_center', sample2.id), placement)
+            self.assertNotIn(('test_center', sample2.id), placement)
+            self.assertNotIn(('another_center', sample1.id), placement) 
\ No newline at end of file
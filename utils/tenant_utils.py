@@ -2,14 +2,94 @@
 Utility functions for tenant management and schema operations.
 """
 
-from django.db import connection, transaction
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.backends.signals import connection_created
 from django.conf import settings
-from django.core.management import call_command
+from django.db.migrations.executor import MigrationExecutor
 from django.core.cache import cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from psycopg2 import sql
 import logging
+import os
+import re
+import sys
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Apps whose tables live inside each tenant schema
+TENANT_APPS = ['samples']
+
+# Center ids become part of a schema identifier; anything outside this
+# allow-list is rejected before touching SQL.
+_CENTER_ID_RE = re.compile(r'^[0-9A-Za-z_]+$')
+
+
+def _validate_center_id(center_id):
+    """Return center_id if it is safe to embed in a schema name."""
+    if not _CENTER_ID_RE.match(str(center_id)):
+        raise ValueError(f"Invalid center id for schema operations: {center_id!r}")
+    return center_id
+
+
+def tenant_cache_key(kind, center_id):
+    """
+    Cache key for a per-tenant flag such as 'center_exists'.
+
+    Hyphens are stripped so the URL form of a center id (hyphenated UUID)
+    and the schema form (32-char hex) address the same cache entry; every
+    reader and invalidator must build keys through here.
+    """
+    return f"{kind}_{str(center_id).replace('-', '')}"
+
+
+# Per-thread stack of schemas activated by TenantSchemaContext. The top
+# of the stack is the schema currently in effect: re-entering it skips the
+# SET round-trip, and exiting a nested context restores the enclosing
+# tenant's search_path rather than resetting straight to public.
+_schema_context_state = threading.local()
+
+
+def _schema_context_stack():
+    """The calling thread's stack of active tenant schemas."""
+    stack = getattr(_schema_context_state, 'stack', None)
+    if stack is None:
+        stack = _schema_context_state.stack = []
+    return stack
+
+# NOTIFY channel used to fan schema create/delete events out to other
+# worker processes, whose local caches a cache.delete() here cannot reach.
+TENANT_NOTIFY_CHANNEL = "tenant_schemas"
+
+
+def _reset_prepared_statements(connection, **kwargs):
+    """Prepared statements live per session; a new connection has none."""
+    connection._tenant_prepared = False
+
+
+connection_created.connect(
+    _reset_prepared_statements, dispatch_uid="tenant_prepared_statements"
+)
+
+# Version counter for the cached schema list. Creating or deleting a schema
+# bumps the counter, which orphans the old list entry instead of racing a
+# delete against concurrent readers.
+_SCHEMA_LIST_VERSION_KEY = "tenant_schemas_version"
+
+
+def _schema_list_cache_key():
+    """Cache key for the tenant schema list at the current version."""
+    version = cache.get(_SCHEMA_LIST_VERSION_KEY, 0)
+    return f"tenant_schemas_v{version}"
+
+
+def _bump_schema_list_version():
+    """Invalidate the cached schema list by moving to a new key."""
+    try:
+        cache.incr(_SCHEMA_LIST_VERSION_KEY)
+    except ValueError:
+        cache.set(_SCHEMA_LIST_VERSION_KEY, 1, None)
+
 
 def create_tenant_schema(center_id):
     """
@@ -21,31 +101,125 @@ def create_tenant_schema(center_id):
     Returns:
         bool: True if schema was created successfully, False otherwise
     """
-    schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{center_id}"
-    
     try:
-        with connection.cursor() as cursor:
-            # Create the schema
-            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {schema_name}")
-            
-            # Grant necessary permissions
-            cursor.execute(f"GRANT USAGE ON SCHEMA {schema_name} TO public")
-            cursor.execute(f"GRANT CREATE ON SCHEMA {schema_name} TO public")
-            
-        # Run migrations for the new schema
-        migrate_tenant_schema(center_id)
+        schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{_validate_center_id(center_id)}"
+        schema = sql.Identifier(schema_name)
+
+        # One atomic block covers both the DDL and the migrations: a failed
+        # migration rolls the schema back instead of leaving an empty one
+        # behind. The create + grants go out as a single round-trip.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql.SQL(
+                    "CREATE SCHEMA IF NOT EXISTS {s}; "
+                    "GRANT USAGE ON SCHEMA {s} TO public; "
+                    "GRANT CREATE ON SCHEMA {s} TO public"
+                ).format(s=schema))
+
+            # Run migrations for the new schema; raising here is what
+            # makes the atomic block roll the CREATE SCHEMA back on a
+            # failed migration instead of committing an empty schema.
+            if not migrate_tenant_schema(center_id):
+                raise RuntimeError(
+                    f"Migrations failed for new tenant schema {schema_name}"
+                )
+
+            # Tell other worker processes to drop their cached view of
+            # this tenant; NOTIFY is only delivered on commit.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    [TENANT_NOTIFY_CHANNEL, str(center_id)]
+                )
         
-        # Clear cache
-        cache.delete(f"center_exists_{center_id}")
+        # Refresh caches: the schema now exists
+        cache.delete(tenant_cache_key('center_exists', center_id))
+        cache.set(tenant_cache_key('schema_exists', center_id), True, 3600)
+        _bump_schema_list_version()
         
-        logger.info(f"Successfully created tenant schema: {schema_name}")
+        logger.info("Successfully created tenant schema: %s", schema_name)
         return True
         
-    except Exception as e:
-        logger.error(f"Failed to create tenant schema {schema_name}: {str(e)}")
+    except Exception:
+        logger.exception("Failed to create tenant schema for center %s", center_id)
         return False
 
 
+def bulk_create_tenant_schemas(center_ids):
+    """
+    Create tenant schemas for many centers in one pass.
+
+    All CREATE SCHEMA + GRANT statements go to the server as a single
+    batched round-trip, then each schema is migrated to head. Migrating
+    per schema is the part that still scales linearly, but the executor
+    path it uses skips all per-tenant management-command overhead.
+
+    The same guarantees as create_tenant_schema hold per tenant: a schema
+    whose migration fails is dropped again rather than left empty, and
+    peers are notified on TENANT_NOTIFY_CHANNEL for every outcome.
+
+    Args:
+        center_ids: Iterable of center IDs
+
+    Returns:
+        dict: Mapping of center ID to True/False creation result
+    """
+    results = {}
+    valid = []
+    for center_id in center_ids:
+        # Plain match check instead of catching _validate_center_id's
+        # ValueError: no exception allocation per malformed id.
+        if _CENTER_ID_RE.match(str(center_id)):
+            valid.append(center_id)
+        else:
+            logger.error("Skipping schema creation for invalid center id: %r", center_id)
+            results[center_id] = False
+
+    if not valid:
+        return results
+
+    ddl_template = sql.SQL(
+        "CREATE SCHEMA IF NOT EXISTS {s}; "
+        "GRANT USAGE ON SCHEMA {s} TO public; "
+        "GRANT CREATE ON SCHEMA {s} TO public"
+    )
+    prefix = settings.TENANT_SCHEMA_PREFIX
+
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql.SQL("; ").join(
+                    ddl_template.format(s=sql.Identifier(f"{prefix}{center_id}"))
+                    for center_id in valid
+                ))
+    except Exception:
+        logger.exception("Failed to bulk-create tenant schemas")
+        results.update({center_id: False for center_id in valid})
+        return results
+
+    for center_id in valid:
+        migrated = migrate_tenant_schema(center_id)
+        results[center_id] = migrated
+        if migrated:
+            cache.delete(tenant_cache_key('center_exists', center_id))
+            cache.set(tenant_cache_key('schema_exists', center_id), True, 3600)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    [TENANT_NOTIFY_CHANNEL, str(center_id)]
+                )
+        else:
+            # The batched DDL already committed, so mirror the
+            # single-schema guarantee (no empty schema survives a failed
+            # migration) by dropping it again; delete_tenant_schema also
+            # notifies peers and resets the caches.
+            delete_tenant_schema(center_id)
+
+    _bump_schema_list_version()
+    logger.info("Bulk-created %d/%d tenant schemas", sum(results.values()), len(results))
+    return results
+
+
 def delete_tenant_schema(center_id):
     """
     Delete a tenant schema and all its data.
@@ -56,21 +230,38 @@ def delete_tenant_schema(center_id):
     Returns:
         bool: True if schema was deleted successfully, False otherwise
     """
-    schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{center_id}"
-    
     try:
-        with connection.cursor() as cursor:
-            # Drop the schema and all its objects
-            cursor.execute(f"DROP SCHEMA IF EXISTS {schema_name} CASCADE")
-        
-        # Clear cache
-        cache.delete(f"center_exists_{center_id}")
+        schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{_validate_center_id(center_id)}"
+
+        def _invalidate_caches():
+            cache.delete(tenant_cache_key('center_exists', center_id))
+            cache.set(tenant_cache_key('schema_exists', center_id), False, 3600)
+            _bump_schema_list_version()
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # Drop the schema and all its objects
+                cursor.execute(
+                    sql.SQL("DROP SCHEMA IF EXISTS {} CASCADE").format(
+                        sql.Identifier(schema_name)
+                    )
+                )
+                # Delivered on commit, alongside the local invalidation
+                cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    [TENANT_NOTIFY_CHANNEL, str(center_id)]
+                )
+
+            # Invalidate only once the drop is durable; a rollback (e.g.
+            # from an enclosing transaction) must not poison the caches
+            # with "schema gone" for a schema that still exists.
+            transaction.on_commit(_invalidate_caches)
         
-        logger.info(f"Successfully deleted tenant schema: {schema_name}")
+        logger.info("Successfully deleted tenant schema: %s", schema_name)
         return True
         
-    except Exception as e:
-        logger.error(f"Failed to delete tenant schema {schema_name}: {str(e)}")
+    except Exception:
+        logger.exception("Failed to delete tenant schema for center %s", center_id)
         return False
 
 
@@ -84,29 +275,57 @@ def migrate_tenant_schema(center_id):
     Returns:
         bool: True if migrations ran successfully, False otherwise
     """
-    schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{center_id}"
-    
+    path_changed = False
     try:
-        # Set search path to tenant schema
-        with connection.cursor() as cursor:
-            cursor.execute(f"SET search_path TO {schema_name}, public")
-        
-        # Run migrations for tenant-specific apps
-        tenant_apps = ['samples']  # Apps that should be in tenant schema
-        
-        for app in tenant_apps:
-            call_command('migrate', app_label=app, verbosity=0, interactive=False)
-        
-        logger.info(f"Successfully migrated tenant schema: {schema_name}")
+        schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{_validate_center_id(center_id)}"
+
+        # One catalog SELECT decides whether there is anything to do;
+        # skipping the executor (loader + planner construction) makes a
+        # no-op migrate nearly free for schemas already at head.
+        outdated, _ = _schemas_needing_migration([(schema_name, center_id)])
+        if not outdated:
+            return True
+
+        # SET LOCAL keeps the tenant search_path scoped to this
+        # transaction, and the atomic block makes a failed migration roll
+        # back as one unit instead of leaving the schema half-built.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    sql.SQL("SET LOCAL search_path TO {}, public").format(
+                        sql.Identifier(schema_name)
+                    )
+                )
+                path_changed = True
+
+            # Drive the executor directly instead of call_command('migrate'):
+            # that skips the management-command setup (system checks, output
+            # wiring) repeated once per app per tenant, and applies nothing
+            # when the plan is already empty.
+            executor = MigrationExecutor(connection)
+            targets = [
+                node for node in executor.loader.graph.leaf_nodes()
+                if node[0] in TENANT_APPS
+            ]
+            plan = executor.migration_plan(targets)
+            if plan:
+                executor.migrate(targets, plan=plan)
+
+        logger.info("Successfully migrated tenant schema: %s", schema_name)
         return True
-        
-    except Exception as e:
-        logger.error(f"Failed to migrate tenant schema {schema_name}: {str(e)}")
+
+    except Exception:
+        logger.exception("Failed to migrate tenant schema for center %s", center_id)
         return False
     finally:
-        # Reset to public schema
-        with connection.cursor() as cursor:
-            cursor.execute(f"SET search_path TO public")
+        if path_changed and connection.in_atomic_block:
+            # Under an outer transaction the LOCAL setting survives the
+            # savepoint release; reset to public explicitly. A session SET
+            # inside a transaction can still be rolled back, so mark the
+            # middleware's path tracker as unknown rather than 'public'.
+            with connection.cursor() as cursor:
+                cursor.execute("SET search_path TO public")
+            connection._tenant_search_path = None
 
 
 def list_tenant_schemas():
@@ -116,37 +335,122 @@ def list_tenant_schemas():
     Returns:
         list: List of tenant schema names
     """
+    cache_key = _schema_list_cache_key()
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        with connection.cursor() as cursor:
+        schemas = list(iter_tenant_schemas())
+        cache.set(cache_key, schemas, 3600)
+        return schemas
+
+    except Exception:
+        logger.exception("Failed to list tenant schemas")
+        return []
+
+
+def iter_tenant_schemas(batch_size=1000):
+    """
+    Yield tenant schema names straight from the catalog, in batches.
+
+    Unlike list_tenant_schemas this bypasses the cache and streams rows
+    from a server-side cursor, batch_size at a time, so maintenance jobs
+    can walk a large fleet of tenants without building the whole list up
+    front. Named cursors need a transaction, so one stays open while the
+    generator is being consumed — iterate promptly and to completion.
+    """
+    connection.ensure_connection()
+    with transaction.atomic():
+        # Django cursors are client-side and materialize the full result
+        # on execute(); only a named psycopg2 cursor on the raw connection
+        # actually bounds memory to the fetch batch.
+        cursor = connection.connection.cursor(name="tenant_schema_iter")
+        cursor.itersize = batch_size
+        try:
+            # Same catalog lookup schema_exists uses: pg_namespace is one
+            # indexed table, while information_schema.schemata is a view
+            # with per-row privilege checks.
             cursor.execute("""
-                SELECT schema_name 
-                FROM information_schema.schemata 
-                WHERE schema_name LIKE %s
+                SELECT nspname
+                FROM pg_catalog.pg_namespace
+                WHERE nspname LIKE %s
             """, [f"{settings.TENANT_SCHEMA_PREFIX}%"])
-            
-            return [row[0] for row in cursor.fetchall()]
-            
-    except Exception as e:
-        logger.error(f"Failed to list tenant schemas: {str(e)}")
-        return []
+
+            for row in cursor:
+                yield row[0]
+        finally:
+            cursor.close()
+
+
+def listen_for_tenant_changes():
+    """
+    Subscribe this process's connection to schema create/delete events.
+
+    Call once per worker (e.g. from a Gunicorn post_fork hook), then call
+    process_tenant_notifications() periodically; together they flush
+    local per-process caches that a cache.delete() in another worker
+    cannot reach.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {TENANT_NOTIFY_CHANNEL}")
+
+
+def process_tenant_notifications():
+    """
+    Drain pending tenant notifications and evict the affected cache keys.
+
+    Returns:
+        int: Number of notifications handled
+    """
+    pg_conn = connection.connection
+    if pg_conn is None:
+        return 0
+
+    pg_conn.poll()
+    handled = 0
+    while pg_conn.notifies:
+        notify = pg_conn.notifies.pop(0)
+        if notify.channel != TENANT_NOTIFY_CHANNEL:
+            continue
+        center_id = notify.payload
+        cache.delete(tenant_cache_key('center_exists', center_id))
+        cache.delete(tenant_cache_key('schema_exists', center_id))
+        handled += 1
+
+    if handled:
+        _bump_schema_list_version()
+    return handled
+
+
+# Compiled lazily so importing this module never touches settings.
+_TENANT_SCHEMA_RE = None
+
+
+def _tenant_schema_pattern():
+    """Compiled pattern matching valid tenant schema names (memoized)."""
+    global _TENANT_SCHEMA_RE
+    if _TENANT_SCHEMA_RE is None:
+        # Center pks are UUIDs stored as 32-char lowercase hex in the
+        # schema name (see Center.save).
+        _TENANT_SCHEMA_RE = re.compile(
+            rf"^{re.escape(settings.TENANT_SCHEMA_PREFIX)}([0-9a-f]{{32}})$"
+        )
+    return _TENANT_SCHEMA_RE
 
 
 def get_tenant_id_from_schema(schema_name):
     """
     Extract tenant ID from schema name.
-    
+
     Args:
         schema_name: Name of the schema
-        
+
     Returns:
-        int: Tenant ID or None if invalid schema name
+        str: Tenant ID (UUID hex) or None if invalid schema name
     """
-    if schema_name.startswith(settings.TENANT_SCHEMA_PREFIX):
-        try:
-            return int(schema_name[len(settings.TENANT_SCHEMA_PREFIX):])
-        except ValueError:
-            return None
-    return None
+    match = _tenant_schema_pattern().match(schema_name)
+    return match.group(1) if match else None
 
 
 def schema_exists(center_id):
@@ -160,22 +464,83 @@ def schema_exists(center_id):
         bool: True if schema exists, False otherwise
     """
     schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{center_id}"
-    
-    try:
+
+    cache_key = tenant_cache_key('schema_exists', center_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    def _prepared_probe():
+        # pg_namespace is an indexed catalog lookup; the prepared
+        # statement skips parse/plan on every call after the first
+        # one per connection.
         with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 1 
-                FROM information_schema.schemata 
-                WHERE schema_name = %s
-            """, [schema_name])
-            
+            if not getattr(connection, '_tenant_prepared', False):
+                cursor.execute(
+                    "PREPARE tenant_schema_exists(text) AS "
+                    "SELECT 1 FROM pg_catalog.pg_namespace WHERE nspname = $1"
+                )
+                connection._tenant_prepared = True
+            cursor.execute("EXECUTE tenant_schema_exists(%s)", [schema_name])
             return cursor.fetchone() is not None
-            
-    except Exception as e:
-        logger.error(f"Failed to check schema existence {schema_name}: {str(e)}")
+
+    try:
+        try:
+            if connection.in_atomic_block:
+                # PREPARE is transactional: any rollback since the flag was
+                # set deallocated the statement. A savepoint keeps a failed
+                # EXECUTE from aborting the enclosing transaction so the
+                # retry below can run.
+                with transaction.atomic():
+                    exists = _prepared_probe()
+            else:
+                exists = _prepared_probe()
+        except DatabaseError:
+            # Stale flag: re-prepare once and retry before giving up.
+            connection._tenant_prepared = False
+            exists = _prepared_probe()
+
+        # Long TTL is safe: create/delete_tenant_schema overwrite the key
+        cache.set(cache_key, exists, 3600)
+        return exists
+
+    except Exception:
+        connection._tenant_prepared = False
+        logger.exception("Failed to check schema existence %s", schema_name)
         return False
 
 
+def schemas_exist(center_ids):
+    """
+    Check which of several tenant schemas exist with one query.
+
+    Callers that loop over schema_exists pay one round-trip per tenant;
+    this batches the whole check into a single ANY() probe.
+
+    Args:
+        center_ids: Iterable of center IDs
+
+    Returns:
+        set: The subset of center IDs whose schema exists
+    """
+    prefix = settings.TENANT_SCHEMA_PREFIX
+    names = {f"{prefix}{center_id}": center_id for center_id in center_ids}
+    if not names:
+        return set()
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nspname FROM pg_catalog.pg_namespace WHERE nspname = ANY(%s)",
+                [list(names)]
+            )
+            return {names[row[0]] for row in cursor.fetchall()}
+
+    except Exception:
+        logger.exception("Failed to batch-check schema existence")
+        return set()
+
+
 def set_tenant_schema_context(center_id):
     """
     Context manager for temporarily switching to a tenant schema.
@@ -199,44 +564,210 @@ class TenantSchemaContext:
     def __init__(self, center_id):
         self.center_id = center_id
         self.schema_name = f"{settings.TENANT_SCHEMA_PREFIX}{center_id}"
-        self.original_schema = None
-    
+        self._already_active = False
+        self._atomic = None
+
     def __enter__(self):
-        # Store current schema
-        with connection.cursor() as cursor:
-            cursor.execute("SHOW search_path")
-            self.original_schema = cursor.fetchone()[0]
-            
-            # Set to tenant schema
-            cursor.execute(f"SET search_path TO {self.schema_name}, public")
-        
+        # Skip the SET round-trip if this thread is already in this schema
+        stack = _schema_context_stack()
+        if stack and stack[-1] == self.schema_name:
+            self._already_active = True
+            return self
+
+        # SET LOCAL scopes the search_path to this transaction: no SHOW or
+        # restore round-trips, and no session state that could leak to
+        # another client through a transaction-mode pooler.
+        self._atomic = transaction.atomic()
+        self._atomic.__enter__()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    sql.SQL("SET LOCAL search_path TO {}, public").format(
+                        sql.Identifier(self.schema_name)
+                    )
+                )
+        except Exception:
+            self._atomic.__exit__(*sys.exc_info())
+            raise
+
+        stack.append(self.schema_name)
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # Restore original schema
-        with connection.cursor() as cursor:
-            if self.original_schema:
-                cursor.execute(f"SET search_path TO {self.original_schema}")
+        # Nested re-entry of the same schema did not change search_path
+        if self._already_active:
+            return
+
+        stack = _schema_context_stack()
+        if stack:
+            stack.pop()
+        try:
+            return self._atomic.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            if connection.in_atomic_block:
+                # The savepoint release keeps the LOCAL setting alive while
+                # an outer transaction is open (a TestCase, or an enclosing
+                # tenant context); restore the enclosing schema explicitly.
+                with connection.cursor() as cursor:
+                    if stack:
+                        cursor.execute(
+                            sql.SQL("SET search_path TO {}, public").format(
+                                sql.Identifier(stack[-1])
+                            )
+                        )
+                        # Session-level SET: if the outermost transaction
+                        # later commits, it sticks to the session and must
+                        # be reset when the last context exits.
+                        connection._tenant_path_dirty = True
+                    else:
+                        cursor.execute("SET search_path TO public")
+                        connection._tenant_path_dirty = False
+                # The middleware's per-connection path tracker can no
+                # longer be trusted (session SETs roll back with the
+                # transaction); mark it unknown.
+                connection._tenant_search_path = None
+            elif getattr(connection, '_tenant_path_dirty', False):
+                # A nested context's session-level restore committed with
+                # the outermost transaction; without this reset the
+                # connection would stay pinned to a tenant schema for all
+                # later work on it (and CONN_MAX_AGE keeps it around).
+                with connection.cursor() as cursor:
+                    cursor.execute("SET search_path TO public")
+                connection._tenant_path_dirty = False
+                connection._tenant_search_path = None
+
+
+# Memoized by _tenant_migration_leaves: migrations on disk cannot change
+# within a process, and building the loader is the expensive part.
+_tenant_migration_leaves_cache = None
+
+
+def _tenant_migration_leaves():
+    """
+    Return the head (app, name) migration pairs for the tenant apps.
+
+    Computed once per process from the local migration graph; a schema
+    whose django_migrations already contains all of these is at head.
+    """
+    global _tenant_migration_leaves_cache
+    if _tenant_migration_leaves_cache is None:
+        from django.db.migrations.loader import MigrationLoader
+
+        loader = MigrationLoader(connection)
+        _tenant_migration_leaves_cache = {
+            (app, name)
+            for app, name in loader.graph.leaf_nodes()
+            if app in TENANT_APPS
+        }
+    return _tenant_migration_leaves_cache
+
+
+def _schemas_needing_migration(pending):
+    """
+    Split (schema_name, center_id) pairs into outdated and up-to-date.
+
+    One metadata SELECT per schema replaces a full migration-planner run
+    for tenants that are already at head — on a deploy with no new tenant
+    migrations this reduces the whole pass to catalog reads.
+    """
+    leaves = _tenant_migration_leaves()
+    outdated = []
+    current = []
+
+    with connection.cursor() as cursor:
+        for schema_name, center_id in pending:
+            # to_regclass returns NULL for a missing relation instead of
+            # erroring; probing by catching the error would abort any
+            # enclosing transaction (create_tenant_schema runs this inside
+            # its atomic block) and roll back the CREATE SCHEMA itself.
+            cursor.execute(
+                "SELECT to_regclass(%s)", [f"{schema_name}.django_migrations"]
+            )
+            if cursor.fetchone()[0] is None:
+                # No migration history yet (fresh schema) - needs migrating
+                outdated.append((schema_name, center_id))
+                continue
+
+            cursor.execute(
+                sql.SQL("SELECT app, name FROM {}.django_migrations").format(
+                    sql.Identifier(schema_name)
+                )
+            )
+            applied = set(cursor.fetchall())
+
+            if leaves <= applied:
+                current.append(schema_name)
             else:
-                cursor.execute("SET search_path TO public")
+                outdated.append((schema_name, center_id))
+
+    return outdated, current
 
 
-def migrate_all_tenant_schemas():
+def _migrate_tenant_worker(center_id):
+    """
+    Run a single tenant migration inside a pool worker process.
+
+    Forked workers inherit the parent's database sockets; close them
+    before the first query so each worker opens its own connection.
+    """
+    connections.close_all()
+    return migrate_tenant_schema(center_id)
+
+
+def migrate_all_tenant_schemas(max_workers=None):
     """
     Run migrations for all existing tenant schemas.
-    
+
+    Schemas are migrated in parallel worker processes: each migration is
+    independent (its own schema, its own connection), so the wall-clock
+    cost scales down with the worker count instead of growing linearly
+    with the tenant count.
+
+    Args:
+        max_workers: Worker process count; defaults to the
+            TENANT_MIGRATE_WORKERS setting or the CPU count.
+
     Returns:
         dict: Results of migration for each schema
     """
     results = {}
-    tenant_schemas = list_tenant_schemas()
-    
-    for schema_name in tenant_schemas:
+    pending = []
+
+    for schema_name in list_tenant_schemas():
         center_id = get_tenant_id_from_schema(schema_name)
         if center_id:
-            results[schema_name] = migrate_tenant_schema(center_id)
+            pending.append((schema_name, center_id))
         else:
             results[schema_name] = False
-            logger.warning(f"Could not extract center ID from schema: {schema_name}")
-    
+            logger.warning("Could not extract center ID from schema: %s", schema_name)
+
+    # Skip schemas already at head; re-migrating them is a no-op that
+    # still pays the full migration-planner cost per schema.
+    pending, up_to_date = _schemas_needing_migration(pending)
+    for schema_name in up_to_date:
+        results[schema_name] = True
+
+    if not pending:
+        return results
+
+    if max_workers is None:
+        max_workers = getattr(settings, 'TENANT_MIGRATE_WORKERS', None) or os.cpu_count() or 1
+
+    # Close parent connections before forking so no worker inherits a
+    # live socket shared with this process.
+    connections.close_all()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_migrate_tenant_worker, center_id): schema_name
+            for schema_name, center_id in pending
+        }
+        for future in as_completed(futures):
+            schema_name = futures[future]
+            try:
+                results[schema_name] = future.result()
+            except Exception:
+                results[schema_name] = False
+                logger.exception("Migration worker failed for %s", schema_name)
+
     return results 
\ No newline at end of file